@@ -5,6 +5,9 @@ Uses scikit-learn models (compatible) instead of TensorFlow
 Trains on YOUR actual CSV data and provides REAL predictions
 """
 
+import time
+_import_started = time.perf_counter()
+
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -12,16 +15,39 @@ from typing import List, Dict, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from contextlib import contextmanager
+import cProfile
+import functools
+import glob
+import hmac
+import inspect
+import io
+import json
+import math
+import pstats
+import re
+import hashlib
+import threading
+import uuid
 import uvicorn
 
-# ML Libraries (Python 3.13 compatible)
-from sklearn.ensemble import RandomForestRegressor, IsolationForest, GradientBoostingRegressor
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, mean_absolute_error
-import joblib
+# Optional fast paths: orjson for encoding, brotli-asgi for compression
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
+
+# ML Libraries (Python 3.13 compatible) are imported inside the functions
+# that use them, so the API can answer health checks before scikit-learn loads
 import os
 
 # ============================================
@@ -30,6 +56,9 @@ import os
 models_cache = {}
 data_cache = {}
 
+# Startup phase durations in seconds, reported by /api/startup
+startup_timings = {'imports': time.perf_counter() - _import_started}
+
 # ============================================
 # DATA LOADING & PREPROCESSING
 # ============================================
@@ -89,17 +118,84 @@ def load_and_prepare_data(csv_path='smart_home_energy_sample.csv'):
     
     return df
 
+# ============================================
+# STARTUP SNAPSHOT
+# ============================================
+
+# Snapshot file layout version; feature-engineering changes are picked up
+# automatically through the source hash in data_fingerprint
+SNAPSHOT_VERSION = 1
+SNAPSHOT_DIR = os.getenv('INFLUX_SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots'))
+
+def data_fingerprint(csv_path):
+    """Hash of the raw CSV bytes plus everything that affects the featured frame"""
+    try:
+        feature_code = inspect.getsource(load_and_prepare_data).encode()
+    except OSError:
+        # Source not shipped (e.g. bytecode-only install) - fall back to the compiled body
+        feature_code = load_and_prepare_data.__code__.co_code
+    
+    digest = hashlib.sha256()
+    with open(csv_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    digest.update(f"|snapshot v{SNAPSHOT_VERSION}|pandas {pd.__version__}|".encode())
+    digest.update(feature_code)
+    return digest.hexdigest()
+
+def load_prepared_data(csv_path):
+    """Load the featured frame from its snapshot when the CSV is unchanged, else rebuild and save it
+    
+    Returns (df, snapshot_hit).
+    """
+    fingerprint = data_fingerprint(csv_path)
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    snapshot_path = os.path.join(SNAPSHOT_DIR, f"{name}.snapshot.pkl")
+    
+    if os.path.exists(snapshot_path):
+        try:
+            snapshot = pd.read_pickle(snapshot_path)
+            if snapshot.get('fingerprint') == fingerprint:
+                df = snapshot['df']
+                print(f"⚡ Loaded {len(df)} prepared records from snapshot {snapshot_path}")
+                return df, True
+            print("♻️ Data changed since last snapshot - rebuilding features")
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable snapshot {snapshot_path}: {e}")
+    
+    df = load_and_prepare_data(csv_path)
+    
+    # Write atomically so a crash mid-write never leaves a truncated snapshot
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+        pd.to_pickle({'fingerprint': fingerprint, 'version': SNAPSHOT_VERSION, 'df': df}, tmp_path)
+        os.replace(tmp_path, snapshot_path)
+        print(f"💾 Saved startup snapshot to {snapshot_path}")
+    except OSError as e:
+        print(f"⚠️ Could not save startup snapshot: {e}")
+    
+    return df, False
+
 # ============================================
 # ML MODEL TRAINING
 # ============================================
 
+# Devices with fewer readings than this are not trained or forecast
+MIN_TRAINING_ROWS = 10
+
 def train_forecasting_model(df, device_id):
     """Train Gradient Boosting model with ENHANCED FEATURES for better accuracy"""
+    from sklearn.ensemble import GradientBoostingRegressor
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import mean_squared_error, mean_absolute_error
+    
     print(f"\n🧠 Training forecasting model for {device_id}...")
     
     device_data = df[df['device_id'] == device_id].copy()
     
-    if len(device_data) < 10:
+    if len(device_data) < MIN_TRAINING_ROWS:
         print(f"⚠️ Insufficient data for {device_id}")
         return None, None
     
@@ -167,6 +263,8 @@ def train_forecasting_model(df, device_id):
 
 def train_feature_importance_model(df, device_id):
     """Train Random Forest for feature importance"""
+    from sklearn.ensemble import RandomForestRegressor
+    
     device_data = df[df['device_id'] == device_id].copy()
     
     feature_cols = [
@@ -187,6 +285,8 @@ def train_feature_importance_model(df, device_id):
 
 def detect_anomalies(df, device_id):
     """Detect anomalies using Isolation Forest"""
+    from sklearn.ensemble import IsolationForest
+    
     device_data = df[df['device_id'] == device_id].copy()
     
     feature_cols = ['power_consumption_kwh', 'duration_minutes', 'indoor_temp_celsius']
@@ -205,75 +305,92 @@ def detect_anomalies(df, device_id):
 # FORECASTING
 # ============================================
 
-def generate_forecast(df, device_id, model, scaler, feature_cols, hours=24):
-    """Generate forecast for next N hours with ENHANCED FEATURES"""
-    device_data = df[df['device_id'] == device_id].copy()
+def forecast_array(df, device_id, model, scaler, feature_cols, hours=24):
+    """Generate forecast for next N hours as a NumPy array (one batched predict call)"""
+    device_data = df[df['device_id'] == device_id]
     
     if len(device_data) == 0:
-        return [0.0] * hours
+        return np.zeros(hours)
     
     # Get recent data for lag features
     last_rows = device_data.tail(24)  # Last 24 records for lag calculations
     last_row = last_rows.iloc[-1]
-    last_time = last_row['timestamp']
+    consumption = last_rows['power_consumption_kwh']
     
-    forecast = []
+    # Future timestamps for the whole horizon at once
+    future_times = pd.DatetimeIndex(last_row['timestamp'] + pd.to_timedelta(np.arange(1, hours + 1), unit='h'))
+    hour = future_times.hour.to_numpy()
+    day_of_week = future_times.dayofweek.to_numpy()
+    is_peak = ((hour >= 17) & (hour <= 21)).astype(int)
     
-    for i in range(hours):
-        future_time = last_time + timedelta(hours=i+1)
+    # Create ENHANCED features for every future timestamp (scalars broadcast across rows)
+    features = pd.DataFrame({
+        # Time features
+        'hour': hour,
+        'day_of_week': day_of_week,
+        'is_weekend': (day_of_week >= 5).astype(int),
+        'month': future_times.month.to_numpy(),
+        'hour_sin': np.sin(2 * np.pi * hour / 24),
+        'hour_cos': np.cos(2 * np.pi * hour / 24),
+        'day_sin': np.sin(2 * np.pi * day_of_week / 7),
+        'day_cos': np.cos(2 * np.pi * day_of_week / 7),
         
-        # Create ENHANCED features for future timestamp
-        features = {
-            # Time features
-            'hour': future_time.hour,
-            'day_of_week': future_time.dayofweek,
-            'is_weekend': 1 if future_time.dayofweek >= 5 else 0,
-            'month': future_time.month,
-            'hour_sin': np.sin(2 * np.pi * future_time.hour / 24),
-            'hour_cos': np.cos(2 * np.pi * future_time.hour / 24),
-            'day_sin': np.sin(2 * np.pi * future_time.dayofweek / 7),
-            'day_cos': np.cos(2 * np.pi * future_time.dayofweek / 7),
-            
-            # Environmental features
-            'indoor_temp_celsius': last_row['indoor_temp_celsius'],
-            'outdoor_temp_celsius': last_row['outdoor_temp_celsius'],
-            'humidity_percent': last_row['humidity_percent'],
-            'temp_diff': last_row['temp_diff'],
-            'temp_humidity': last_row['temp_humidity'],
-            
-            # Occupancy features
-            'occupancy_count': last_row['occupancy_count'],
-            'motion_detected': last_row['motion_detected'],
-            'occupancy_motion': last_row['occupancy_motion'],
-            
-            # Usage features
-            'duration_minutes': last_row['duration_minutes'],
-            'tariff_rate': last_row['tariff_rate'],
-            'is_peak_tariff': 1 if 17 <= future_time.hour <= 21 else 0,
-            
-            # Peak indicators
-            'is_peak_hour': 1 if 17 <= future_time.hour <= 21 else 0,
-            'is_morning_peak': 1 if 6 <= future_time.hour <= 9 else 0,
-            'is_night': 1 if (future_time.hour >= 22 or future_time.hour <= 5) else 0,
-            
-            # LAG FEATURES - Use historical data
-            'lag_1h': last_rows.iloc[-1]['power_consumption_kwh'] if len(last_rows) >= 1 else 0,
-            'lag_3h': last_rows.iloc[-3]['power_consumption_kwh'] if len(last_rows) >= 3 else 0,
-            'lag_24h': last_rows.iloc[0]['power_consumption_kwh'] if len(last_rows) >= 24 else 0,
-            
-            # ROLLING AVERAGES - Use recent consumption patterns
-            'rolling_3h': last_rows.tail(3)['power_consumption_kwh'].mean() if len(last_rows) >= 3 else 0,
-            'rolling_6h': last_rows.tail(6)['power_consumption_kwh'].mean() if len(last_rows) >= 6 else 0,
-            'rolling_24h': last_rows['power_consumption_kwh'].mean()
-        }
+        # Environmental features
+        'indoor_temp_celsius': last_row['indoor_temp_celsius'],
+        'outdoor_temp_celsius': last_row['outdoor_temp_celsius'],
+        'humidity_percent': last_row['humidity_percent'],
+        'temp_diff': last_row['temp_diff'],
+        'temp_humidity': last_row['temp_humidity'],
         
-        X = pd.DataFrame([features])[feature_cols]
-        X_scaled = scaler.transform(X)
+        # Occupancy features
+        'occupancy_count': last_row['occupancy_count'],
+        'motion_detected': last_row['motion_detected'],
+        'occupancy_motion': last_row['occupancy_motion'],
         
-        pred = model.predict(X_scaled)[0]
-        forecast.append(max(0, float(pred)))
-    
-    return forecast
+        # Usage features
+        'duration_minutes': last_row['duration_minutes'],
+        'tariff_rate': last_row['tariff_rate'],
+        'is_peak_tariff': is_peak,
+        
+        # Peak indicators
+        'is_peak_hour': is_peak,
+        'is_morning_peak': ((hour >= 6) & (hour <= 9)).astype(int),
+        'is_night': ((hour >= 22) | (hour <= 5)).astype(int),
+        
+        # LAG FEATURES - Use historical data
+        'lag_1h': consumption.iloc[-1],
+        'lag_3h': consumption.iloc[-3] if len(last_rows) >= 3 else 0,
+        'lag_24h': consumption.iloc[0] if len(last_rows) >= 24 else 0,
+        
+        # ROLLING AVERAGES - Use recent consumption patterns
+        'rolling_3h': consumption.tail(3).mean() if len(last_rows) >= 3 else 0,
+        'rolling_6h': consumption.tail(6).mean() if len(last_rows) >= 6 else 0,
+        'rolling_24h': consumption.mean()
+    })
+    
+    X_scaled = scaler.transform(features[feature_cols])
+    return np.maximum(model.predict(X_scaled), 0.0)
+
+def forecast_timestamps(last_time, hours, first_offset=1):
+    """ISO-8601 timestamps for N hourly steps, starting first_offset hours after last_time
+    
+    Matches Timestamp.isoformat(); naive whole-second data (the common case)
+    is formatted in one vectorized NumPy call.
+    """
+    start = pd.Timestamp(last_time)
+    times = start + pd.to_timedelta(np.arange(first_offset, first_offset + hours), unit='h')
+    if start.tz is None and start.microsecond == 0 and start.nanosecond == 0:
+        return np.datetime_as_string(times.to_numpy(), unit='s').tolist()
+    # Keep the UTC offset and fractional seconds for tz-aware or sub-second data
+    return [t.isoformat() for t in times]
+
+def forecast_devices(df, devices, hours):
+    """Yield (device_id, forecast array) for every device with enough data to train on"""
+    for device in devices:
+        result = train_forecasting_model(df, device)
+        if result[0] is not None:
+            model, scaler, feature_cols, metrics = result
+            yield device, forecast_array(df, device, model, scaler, feature_cols, hours)
 
 # ============================================
 # OPTIMIZATION
@@ -305,11 +422,193 @@ def calculate_optimization(df, device_id):
         'potential_savings': float(monthly_savings)
     }
 
+# ============================================
+# RESPONSE ENCODING
+# ============================================
+
+def _json_default(obj):
+    """Convert NumPy/pandas values for the stdlib JSON fallback"""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (pd.Timestamp, datetime)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _finite(obj):
+    """Replace NaN/Infinity with None, matching orjson's output in the stdlib fallback"""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _finite(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(v) for v in obj]
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return _finite(obj.tolist())
+    return obj
+
+def dumps(content) -> bytes:
+    """Serialize to JSON bytes, using orjson (with native NumPy support) when available"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_json_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(_finite(content), default=_json_default, separators=(',', ':'), allow_nan=False).encode('utf-8')
+
+class CompressionMiddleware:
+    """Compress responses (brotli when installed, gzip otherwise), except on streaming paths
+    
+    Streaming endpoints are passed through untouched so each chunk is sent as
+    soon as it is produced instead of sitting in the compressor's buffer.
+    """
+
+    def __init__(self, app, uncompressed_paths=(), minimum_size=1000):
+        self.app = app
+        self.uncompressed_paths = set(uncompressed_paths)
+        if BrotliMiddleware is not None:
+            self.compressed_app = BrotliMiddleware(app, minimum_size=minimum_size, gzip_fallback=True)
+        else:
+            self.compressed_app = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] in self.uncompressed_paths:
+            await self.app(scope, receive, send)
+        else:
+            await self.compressed_app(scope, receive, send)
+
+class FastJSONResponse(JSONResponse):
+    """JSON response that encodes NumPy arrays/scalars directly, without converting to lists first"""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+# ============================================
+# PROFILING (opt-in, admin only)
+# ============================================
+
+# Profiling is disabled unless an admin token is configured
+ADMIN_TOKEN = os.getenv('INFLUX_ADMIN_TOKEN')
+PROFILE_DIR = os.getenv('INFLUX_PROFILE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles'))
+MAX_STORED_PROFILES = 50
+
+# cProfile is process-wide on Python 3.12+, so only one request is profiled at a time
+profiler_lock = threading.Lock()
+
+def require_admin(request: Request):
+    """Reject the request unless it carries the configured admin token"""
+    token = request.headers.get('x-admin-token', '')
+    if not ADMIN_TOKEN or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+def profiling_requested(request: Request):
+    """Profiling is switched on with an `X-Profile: 1` header or `?profile=1`"""
+    flag = request.headers.get('x-profile') or request.query_params.get('profile')
+    return flag is not None and flag.lower() in ('1', 'true', 'yes')
+
+def profile_paths(profile_id):
+    """(.prof file, .json metadata) for a profile id; ids are uuid4 hex so they are safe as file names"""
+    if not re.fullmatch(r'[0-9a-f]{32}', profile_id):
+        return None, None
+    base = os.path.join(PROFILE_DIR, profile_id)
+    return f"{base}.prof", f"{base}.json"
+
+def stored_profiles():
+    """Profiles on disk, newest first (shared by every worker process)"""
+    profiles = []
+    for path in glob.glob(os.path.join(PROFILE_DIR, '*.prof')):
+        # Another request or worker may prune a file between the glob and the stat
+        try:
+            profiles.append((os.path.getmtime(path), path))
+        except FileNotFoundError:
+            continue
+    return [path for _, path in sorted(profiles, reverse=True)]
+
+def prune_profiles():
+    """Keep only the most recent MAX_STORED_PROFILES profiles on disk"""
+    for path in stored_profiles()[MAX_STORED_PROFILES:]:
+        for stale in (path, os.path.splitext(path)[0] + '.json'):
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+
+@contextmanager
+def request_profiler(request: Request, response: Response, name: str):
+    """cProfile the enclosed block when requested; the stored profile id is returned in X-Profile-Id
+    
+    Requests that raise are not stored, since their error response carries no id.
+    Only one request is profiled at a time (409 otherwise). On Python 3.12+ the
+    profiler also sees calls made by other threads while it runs, so profile
+    under otherwise light traffic for a clean single-request picture.
+    """
+    if not profiling_requested(request):
+        yield
+        return
+    
+    require_admin(request)
+    if not profiler_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="Another request is being profiled, retry shortly")
+    
+    try:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # Another profiling tool (e.g. a debugger) already owns the interpreter hook
+            raise HTTPException(status_code=409, detail=f"Profiler unavailable: {e}")
+        
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            profiler.disable()
+        elapsed = time.perf_counter() - started
+        
+        profile_id = uuid.uuid4().hex
+        prof_path, meta_path = profile_paths(profile_id)
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        profiler.dump_stats(prof_path)
+        with open(meta_path, 'w') as f:
+            json.dump({
+                "id": profile_id,
+                "endpoint": name,
+                "path": request.url.path,
+                "duration_ms": round(elapsed * 1000, 2),
+                "created_at": datetime.now().isoformat()
+            }, f)
+    finally:
+        profiler_lock.release()
+    
+    prune_profiles()
+    response.headers['X-Profile-Id'] = profile_id
+    print(f"🔬 Profiled {request.url.path} in {elapsed * 1000:.1f} ms -> {profile_id}")
+
+def profiled(name):
+    """Decorator: run a sync endpoint under request_profiler
+    
+    Adds Request/Response parameters to the endpoint's signature so FastAPI
+    injects them, without the endpoint itself having to declare them.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, _profile_request: Request, _profile_response: Response, **kwargs):
+            with request_profiler(_profile_request, _profile_response, name):
+                return func(*args, **kwargs)
+        
+        signature = inspect.signature(func)
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter('_profile_request', inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            inspect.Parameter('_profile_response', inspect.Parameter.KEYWORD_ONLY, annotation=Response)
+        ])
+        return wrapper
+    return decorator
+
 # ============================================
 # FASTAPI APP
 # ============================================
 
-app = FastAPI(title="InFlux Real ML API", version="2.0.0")
+app = FastAPI(title="InFlux Real ML API", version="2.0.0", default_response_class=FastJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -319,34 +618,69 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large payloads, leaving NDJSON streams unbuffered
+app.add_middleware(CompressionMiddleware, uncompressed_paths=["/api/forecast/stream"], minimum_size=1000)
+
+def print_startup_report():
+    """Print how long each startup phase took"""
+    print("\n⏱️ Startup breakdown:")
+    for phase, seconds in startup_timings.items():
+        print(f"   {phase:<16} {seconds * 1000:>9.1f} ms")
+
+def warm_models(df):
+    """Import scikit-learn and pre-train forecasting models in the background
+    
+    Failures are logged and exposed through /api/startup instead of silently
+    killing the warm-up thread; endpoints still train on demand.
+    """
+    phase = 'sklearn_import'
+    started = time.perf_counter()
+    try:
+        import sklearn.ensemble, sklearn.model_selection, sklearn.metrics  # noqa: F401
+        startup_timings[phase] = time.perf_counter() - started
+        
+        # Pre-train models for all devices
+        print("\n🤖 Training models for all devices...")
+        phase = 'model_training'
+        started = time.perf_counter()
+        models_dict = {}
+        feature_cols = None
+        
+        for device_id in df['device_id'].unique():
+            result = train_forecasting_model(df, device_id)
+            if result[0] is not None:
+                model, scaler, feature_cols_device, metrics = result
+                models_dict[device_id] = model
+                models_cache.setdefault(f"model_{device_id}", result)
+                if feature_cols is None:
+                    feature_cols = feature_cols_device
+        
+        # Store in models_cache
+        models_cache['models'] = models_dict
+        models_cache['feature_columns'] = feature_cols
+        startup_timings[phase] = time.perf_counter() - started
+        print(f"✅ Trained {len(models_dict)} models successfully!")
+    except Exception as e:
+        import traceback
+        startup_timings[f"{phase}_failed"] = time.perf_counter() - started
+        models_cache['warmup_error'] = f"{phase}: {e}"
+        print(f"❌ Model warm-up failed during {phase}: {traceback.format_exc()}")
+    finally:
+        print_startup_report()
+
 @app.on_event("startup")
 async def startup_event():
-    """Load data and train models on startup"""
-    global data_cache, models_cache
-    import os
-    csv_path = os.path.join(os.path.dirname(__file__), 'smart_home_energy_sample.csv')
-    df = load_and_prepare_data(csv_path)
-    data_cache['df'] = df
+    """Load prepared data, then train models in the background so health checks pass immediately"""
+    csv_path = os.getenv('INFLUX_DATA_CSV', os.path.join(os.path.dirname(__file__), 'smart_home_energy_sample.csv'))
     
-    # Pre-train models for all devices
-    print("\n🤖 Training models for all devices...")
-    models_dict = {}
-    feature_cols = None
-    
-    for device_id in df['device_id'].unique():
-        result = train_forecasting_model(df, device_id)
-        if result[0] is not None:
-            model, scaler, feature_cols_device, metrics = result
-            models_dict[device_id] = model
-            if feature_cols is None:
-                feature_cols = feature_cols_device
-    
-    # Store in models_cache
-    models_cache['models'] = models_dict
-    models_cache['feature_columns'] = feature_cols
-    
-    print(f"✅ Trained {len(models_dict)} models successfully!")
+    started = time.perf_counter()
+    df, snapshot_hit = load_prepared_data(csv_path)
+    startup_timings['data_snapshot' if snapshot_hit else 'data_prepare'] = time.perf_counter() - started
+    data_cache['df'] = df
+    data_cache['snapshot_hit'] = snapshot_hit
     print("✅ Data loaded and ready!")
+    
+    threading.Thread(target=warm_models, args=(df,), name="model-warmup", daemon=True).start()
 
 @app.get("/")
 def root():
@@ -355,9 +689,20 @@ def root():
         "service": "InFlux Real ML API",
         "version": "2.0.0",
         "ml_enabled": True,
+        "models_ready": 'models' in models_cache,
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/api/startup")
+def get_startup_report():
+    """Startup time breakdown per phase"""
+    return {
+        "phases_ms": {phase: round(seconds * 1000, 1) for phase, seconds in startup_timings.items()},
+        "snapshot_hit": data_cache.get('snapshot_hit', False),
+        "models_ready": 'models' in models_cache,
+        "warmup_error": models_cache.get('warmup_error')
+    }
+
 @app.get("/api/devices")
 def get_devices():
     """Get list of devices"""
@@ -372,6 +717,7 @@ def get_devices():
     }
 
 @app.get("/api/device/{device_id}/insights")
+@profiled('insights')
 def get_device_insights(device_id: str):
     """Get REAL ML insights for a device"""
     df = data_cache.get('df')
@@ -395,7 +741,7 @@ def get_device_insights(device_id: str):
         model, scaler, feature_cols, metrics = models_cache[cache_key]
     
     # Generate forecast
-    forecast_24h = generate_forecast(df, device_id, model, scaler, feature_cols, hours=24)
+    forecast_24h = forecast_array(df, device_id, model, scaler, feature_cols, hours=24)
     
     # Feature importance
     importance = train_feature_importance_model(df, device_id)
@@ -408,11 +754,11 @@ def get_device_insights(device_id: str):
     
     # Calculate cost
     avg_tariff = df[df['device_id'] == device_id]['tariff_rate'].mean()
-    daily_cost = sum(forecast_24h) * avg_tariff
+    daily_cost = float(forecast_24h.sum()) * avg_tariff
     
     return {
         "device_id": device_id,
-        "next_24h_forecast_kwh": [round(x, 3) for x in forecast_24h],
+        "next_24h_forecast_kwh": np.round(forecast_24h, 3).tolist(),
         "predicted_daily_cost": round(daily_cost, 2),
         "optimal_usage_windows": optimization['optimal_windows'],
         "estimated_savings": round(optimization['potential_savings'], 2),
@@ -427,6 +773,7 @@ def get_device_insights(device_id: str):
     }
 
 @app.get("/api/dashboard")
+@profiled('dashboard')
 def get_dashboard():
     """Get REAL dashboard data from CSV"""
     df = data_cache.get('df')
@@ -449,19 +796,14 @@ def get_dashboard():
     
     # Train model for first device to get 24h prediction
     devices = df['device_id'].unique()
-    total_forecast = []
-    
-    for device in devices[:3]:  # Use top 3 devices
-        result = train_forecasting_model(df, device)
-        if result[0] is not None:
-            model, scaler, feature_cols, metrics = result
-            forecast = generate_forecast(df, device, model, scaler, feature_cols, 24)
-            if not total_forecast:
-                total_forecast = forecast
-            else:
-                total_forecast = [total_forecast[i] + forecast[i] for i in range(24)]
+    device_forecasts = [forecast for _, forecast in forecast_devices(df, devices[:3], hours=24)]  # Use top 3 devices
     
-    predicted_24h = sum(total_forecast) if total_forecast else today_consumption * 1.1
+    if device_forecasts:
+        total_forecast = np.vstack(device_forecasts).sum(axis=0)
+        predicted_24h = float(total_forecast.sum())
+    else:
+        total_forecast = np.full(24, today_consumption / 24)
+        predicted_24h = today_consumption * 1.1
     
     # Appliance breakdown
     device_consumption = df.groupby('device_id')['power_consumption_kwh'].sum().nlargest(4)
@@ -479,19 +821,20 @@ def get_dashboard():
         })
     
     # Energy forecast with timestamps
-    current_time = df['timestamp'].max()
-    energy_forecast = []
-    for i in range(24):
-        timestamp = (current_time + timedelta(hours=i)).isoformat()
-        value = total_forecast[i] if total_forecast else today_consumption / 24
-        energy_forecast.append({
-            "timestamp": timestamp,
-            "forecast": round(value, 2),
-            "confidence": {
-                "lower": round(value * 0.9, 2),
-                "upper": round(value * 1.1, 2)
-            }
-        })
+    timestamps = forecast_timestamps(df['timestamp'].max(), 24, first_offset=0)
+    energy_forecast = [{
+        "timestamp": timestamp,
+        "forecast": value,
+        "confidence": {
+            "lower": lower,
+            "upper": upper
+        }
+    } for timestamp, value, lower, upper in zip(
+        timestamps,
+        np.round(total_forecast, 2).tolist(),
+        np.round(total_forecast * 0.9, 2).tolist(),
+        np.round(total_forecast * 1.1, 2).tolist()
+    )]
     
     # Optimization schedule
     hourly_tariff = df.groupby('hour')['tariff_rate'].mean().sort_values()
@@ -554,91 +897,131 @@ def get_dashboard():
     }
 
 @app.get("/api/forecast")
-async def get_forecast():
-    """Get 7-day energy forecast - uses same logic as dashboard"""
+def get_forecast(format: str = Query("rows", pattern="^(rows|columnar)$")):
+    """Get 7-day energy forecast - uses same logic as dashboard
+    
+    format=rows returns lists of objects (default); format=columnar returns
+    the same data as parallel arrays, which is much smaller on the wire.
+    """
     try:
         df = data_cache.get('df')
         if df is None:
             raise HTTPException(status_code=500, detail="Data not loaded")
         
         # Use same approach as dashboard - train and forecast for multiple devices
+        # Generate 7 days (168 hours) of forecasts, top 5 devices for faster response
         devices = df['device_id'].unique()
-        all_device_forecasts = []
+        all_device_forecasts = [forecast for _, forecast in forecast_devices(df, devices[:5], hours=168)]
         
-        for device in devices[:5]:  # Use top 5 devices for faster response
-            result = train_forecasting_model(df, device)
-            if result[0] is not None:
-                model, scaler, feature_cols, metrics = result
-                # Generate 7 days (168 hours) of forecasts
-                forecast_168h = generate_forecast(df, device, model, scaler, feature_cols, hours=168)
-                all_device_forecasts.append(forecast_168h)
-        
-        # Aggregate forecasts from all devices
         if not all_device_forecasts:
             raise HTTPException(status_code=500, detail="No forecasts generated")
         
-        # Sum forecasts across devices for total energy
-        total_forecast = [sum(device[i] for device in all_device_forecasts) 
-                         for i in range(len(all_device_forecasts[0]))]
-        
-        # Get the last date in our dataset
-        last_date = pd.to_datetime(df['timestamp']).max()
+        # Sum forecasts across devices for total energy, shaped (day, hour)
+        total_forecast = np.round(np.vstack(all_device_forecasts).sum(axis=0), 2)
+        by_day = total_forecast.reshape(-1, 24)
         
-        # Format forecast data with timestamps
-        forecast_data = []
-        for hour_offset, value in enumerate(total_forecast):
-            forecast_time = last_date + timedelta(hours=hour_offset+1)
-            forecast_data.append({
-                "day": (hour_offset // 24) + 1,
-                "hour": hour_offset % 24,
-                "value": round(value, 2),
-                "timestamp": forecast_time.isoformat()
-            })
+        # Timestamps following the last date in our dataset
+        timestamps = forecast_timestamps(df['timestamp'].max(), len(total_forecast))
         
-        # Group by day for summary
-        forecast_7_days = []
-        for day in range(7):
-            day_data = [f for f in forecast_data if f['day'] == day + 1]
-            if day_data:
-                avg_value = sum(f['value'] for f in day_data) / len(day_data)
-                forecast_7_days.append({
-                    "day": str(day + 1),
-                    "value": round(avg_value, 2),
-                    "confidence": 0.85 + np.random.random() * 0.1
-                })
+        # Daily averages for summary
+        daily_avg = np.round(by_day.mean(axis=1), 2)
+        confidence = 0.85 + np.random.random(len(daily_avg)) * 0.1
         
-        # Get peak periods from first 7 days
-        peak_periods = []
-        hourly_avg = {}
-        for hour in range(24):
-            hour_data = [f for f in forecast_data[:168] if f['hour'] == hour]
-            if hour_data:
-                hourly_avg[hour] = sum(f['value'] for f in hour_data) / len(hour_data)
+        # Peak periods from hourly averages across the 7 days
+        hourly_avg = by_day.mean(axis=0)
+        peak_hours = np.argsort(-hourly_avg, kind='stable')[:3]
+        peak_periods = [{
+            "time": f"{hour:02d}:00 - {(hour+1)%24:02d}:00",
+            "date": f"Day {(i % 7) + 1}",
+            "value": f"{hourly_avg[hour]:.2f} kW/h"
+        } for i, hour in enumerate(peak_hours.tolist())]
+        peak_value = round(float(hourly_avg.max()), 2)
         
-        if hourly_avg:
-            sorted_hours = sorted(hourly_avg.items(), key=lambda x: x[1], reverse=True)
-            for i, (hour, value) in enumerate(sorted_hours[:3]):
-                peak_periods.append({
-                    "time": f"{hour:02d}:00 - {(hour+1)%24:02d}:00",
-                    "date": f"Day {(i % 7) + 1}",
-                    "value": f"{value:.2f} kW/h"
-                })
-            peak_value = max(hourly_avg.values())
+        # First 24 hours for detailed view
+        first_day = np.arange(24)
+        if format == "columnar":
+            payload = {
+                "forecast_7_days": {
+                    "day": [str(day + 1) for day in range(len(daily_avg))],
+                    "value": daily_avg,
+                    "confidence": confidence
+                },
+                "peak_periods": peak_periods,
+                "peak_value": peak_value,
+                "hourly_forecast": {
+                    "day": first_day // 24 + 1,
+                    "hour": first_day % 24,
+                    "value": total_forecast[:24],
+                    "timestamp": timestamps[:24]
+                }
+            }
         else:
-            peak_value = 0
+            payload = {
+                "forecast_7_days": [{
+                    "day": str(day + 1),
+                    "value": value,
+                    "confidence": conf
+                } for day, (value, conf) in enumerate(zip(daily_avg.tolist(), confidence.tolist()))],
+                "peak_periods": peak_periods,
+                "peak_value": peak_value,
+                "hourly_forecast": [{
+                    "day": (hour_offset // 24) + 1,
+                    "hour": hour_offset % 24,
+                    "value": value,
+                    "timestamp": timestamps[hour_offset]
+                } for hour_offset, value in enumerate(total_forecast[:24].tolist())]
+            }
         
-        return {
-            "forecast_7_days": forecast_7_days,
-            "peak_periods": peak_periods,
-            "peak_value": round(peak_value, 2),
-            "hourly_forecast": forecast_data[:24]  # First 24 hours for detailed view
-        }
+        # Returned directly so NumPy arrays skip FastAPI's generic encoder
+        return FastJSONResponse(payload)
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
         print(f"❌ Forecast error: {error_details}")
         raise HTTPException(status_code=500, detail=f"Forecast failed: {str(e)}")
 
+@app.get("/api/forecast/stream")
+def stream_forecast(hours: int = Query(168, ge=1, le=24 * 31)):
+    """Stream per-device forecasts as NDJSON, one line per device as soon as it is ready
+    
+    The first line holds the shared timestamp axis, the devices that will be
+    forecast and those skipped for too little data. Each following line is
+    {"device_id": ..., "value": [...]} or {"device_id": ..., "error": ...},
+    and the stream ends with {"done": true, "completed": n, "failed": m}.
+    """
+    df = data_cache.get('df')
+    if df is None:
+        raise HTTPException(status_code=500, detail="Data not loaded")
+    
+    counts = df['device_id'].value_counts()
+    devices = [device for device in df['device_id'].unique() if counts[device] >= MIN_TRAINING_ROWS]
+    skipped = [device for device in df['device_id'].unique() if counts[device] < MIN_TRAINING_ROWS]
+    timestamps = forecast_timestamps(df['timestamp'].max(), hours)
+    
+    def lines():
+        yield dumps({"hours": hours, "devices": devices, "skipped": skipped, "timestamp": timestamps}) + b"\n"
+        completed = failed = 0
+        for device in devices:
+            try:
+                model, scaler, feature_cols, metrics = train_forecasting_model(df, device)
+                forecast = forecast_array(df, device, model, scaler, feature_cols, hours)
+            except Exception as e:
+                failed += 1
+                print(f"❌ Stream forecast failed for {device}: {e}")
+                yield dumps({"device_id": device, "error": str(e)}) + b"\n"
+                continue
+            completed += 1
+            yield dumps({"device_id": device, "value": np.round(forecast, 3)}) + b"\n"
+        yield dumps({"done": True, "completed": completed, "failed": failed}) + b"\n"
+    
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"X-Accel-Buffering": "no"}
+    )
+
 @app.get("/api/appliances")
 async def get_appliances():
     """Get all appliances/devices with their stats"""
@@ -682,6 +1065,38 @@ async def get_appliances():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Appliances fetch failed: {str(e)}")
 
+@app.get("/api/admin/profiles")
+def list_profiles(request: Request):
+    """List stored request profiles (admin only)"""
+    require_admin(request)
+    profiles = []
+    for path in stored_profiles():
+        try:
+            with open(os.path.splitext(path)[0] + '.json') as f:
+                profiles.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return {"profiles": profiles, "total": len(profiles)}
+
+@app.get("/api/admin/profiles/{profile_id}")
+def download_profile(profile_id: str, request: Request,
+                     format: str = Query("prof", pattern="^(prof|text)$"),
+                     sort: str = Query("cumulative", pattern="^(cumulative|tottime|ncalls)$"),
+                     limit: int = Query(40, ge=1, le=500)):
+    """Download a stored profile as a .prof file (snakeviz/pstats) or a text summary (admin only)"""
+    require_admin(request)
+    prof_path, _ = profile_paths(profile_id)
+    if prof_path is None or not os.path.exists(prof_path):
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    
+    if format == "text":
+        out = io.StringIO()
+        pstats.Stats(prof_path, stream=out).sort_stats(sort).print_stats(limit)
+        return PlainTextResponse(out.getvalue())
+    
+    return FileResponse(prof_path, media_type="application/octet-stream",
+                        filename=os.path.basename(prof_path))
+
 if __name__ == "__main__":
     print("""
 ╔══════════════════════════════════════════════════════════════╗
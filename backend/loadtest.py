@@ -0,0 +1,235 @@
+"""
+InFlux Load Test Harness
+========================
+Drives every API route at a given concurrency and reports
+p50/p95/p99 latency and throughput per route.
+
+By default it generates a synthetic dataset, boots api.py against it
+with uvicorn and tears it down afterwards. Use --url to target an
+already running server instead.
+
+    python loadtest.py --devices 20 --hours 336 --concurrency 8 --requests 50
+    python loadtest.py --url http://localhost:8000 --routes / /api/dashboard
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import numpy as np
+import pandas as pd
+
+# Routes exercised by default; {device_id} is filled from /api/devices
+DEFAULT_ROUTES = [
+    "/",
+    "/api/devices",
+    "/api/device/{device_id}/insights",
+    "/api/dashboard",
+    "/api/forecast",
+    "/api/forecast?format=columnar",
+    "/api/forecast/stream",
+    "/api/appliances",
+]
+
+DEVICE_TYPES = [
+    ('AC', 'AirConditioner', 1500), ('FAN', 'Fan', 75), ('FRIDGE', 'Refrigerator', 150),
+    ('LAPTOP', 'Laptop', 65), ('LIGHT', 'LED_Light', 12), ('MICRO', 'Microwave', 1200),
+    ('ROUTER', 'Router', 10), ('TV', 'Television', 120), ('WH', 'WaterHeater', 2000),
+    ('WM', 'WashingMachine', 500),
+]
+
+# ============================================
+# SYNTHETIC DATA
+# ============================================
+
+def generate_synthetic_data(csv_path, devices=10, hours=168, seed=42):
+    """Write a CSV with the same schema as smart_home_energy_sample.csv"""
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range('2024-07-01', periods=hours, freq='h')
+    hour = timestamps.hour.to_numpy()
+    is_peak = ((hour >= 17) & (hour <= 21)).astype(int)
+    daily_cycle = 1 + 0.5 * np.sin(2 * np.pi * (hour - 6) / 24)
+
+    frames = []
+    for i in range(devices):
+        prefix, device_type, rating = DEVICE_TYPES[i % len(DEVICE_TYPES)]
+        duration = rng.integers(5, 60, hours)
+        frames.append(pd.DataFrame({
+            'device_id': f"{prefix}_{i:02d}",
+            'device_type': device_type,
+            'power_rating_watt': rating,
+            'energy_efficiency_rating': rng.integers(1, 6),
+            'standby_power_watt': round(rating * 0.002, 2),
+            'mode_of_operation': 'Normal',
+            'age_of_appliance_years': round(float(rng.uniform(0.5, 8)), 1),
+            'maintenance_last_date': '2023-06-01',
+            'peak_power_draw_watt': int(rating * 1.2),
+            'timestamp': timestamps,
+            'duration_minutes': duration,
+            'power_consumption_kwh': np.round(rating / 1000 * duration / 60 * daily_cycle * rng.uniform(0.8, 1.2, hours), 3),
+            'tariff_rate': np.where(is_peak == 1, 8.0, 5.0),
+            'is_peak_tariff': is_peak,
+            'indoor_temp_celsius': np.round(24 + rng.normal(0, 1.5, hours), 1),
+            'outdoor_temp_celsius': np.round(28 + 4 * daily_cycle + rng.normal(0, 2, hours), 1),
+            'humidity_percent': rng.integers(40, 80, hours),
+            'occupancy_count': rng.integers(0, 5, hours),
+            'motion_detected': rng.integers(0, 2, hours),
+        }))
+
+    pd.concat(frames, ignore_index=True).to_csv(csv_path, index=False)
+    print(f"📦 Synthetic dataset: {devices} devices x {hours} hours -> {csv_path}")
+
+# ============================================
+# LOCAL SERVER
+# ============================================
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(csv_path, snapshot_dir, port, startup_timeout=600):
+    """Boot api.py with uvicorn against csv_path and wait until it answers GET /
+    
+    The startup snapshot goes to snapshot_dir so runs never touch backend/snapshots/.
+    """
+    env = dict(os.environ, INFLUX_DATA_CSV=csv_path, INFLUX_SNAPSHOT_DIR=snapshot_dir)
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'api:app', '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning'],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+
+    url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    while time.perf_counter() - started < startup_timeout:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited during startup (code {proc.returncode})")
+        try:
+            httpx.get(url + '/', timeout=1.0).raise_for_status()
+            print(f"🚀 Server ready at {url} after {time.perf_counter() - started:.1f}s")
+            return proc, url
+        except httpx.HTTPError:
+            time.sleep(0.25)
+
+    proc.terminate()
+    raise RuntimeError(f"Server did not become ready within {startup_timeout}s")
+
+def wait_for_warmup(url, timeout=600):
+    """Block until background model warm-up has finished, so it does not skew latencies"""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        response = httpx.get(url + '/api/startup', timeout=5.0)
+        if response.status_code == 404:
+            print("⚠️ Server has no /api/startup (older deploy) - not waiting for model warm-up")
+            return
+        report = response.json()
+        if report.get('warmup_error'):
+            print(f"⚠️ Model warm-up failed ({report['warmup_error']}) - endpoints will train on demand")
+            return
+        if report.get('models_ready'):
+            print(f"🔥 Models warm after {time.perf_counter() - started:.1f}s")
+            return
+        time.sleep(0.25)
+    raise RuntimeError(f"Model warm-up did not finish within {timeout}s")
+
+# ============================================
+# LOAD GENERATION
+# ============================================
+
+async def run_route(client, route, requests, concurrency):
+    """Issue `requests` GETs against route with at most `concurrency` in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await client.get(route)
+                await response.aread()
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    wall = time.perf_counter() - started
+
+    ms = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "route": route,
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "p99_ms": p99,
+        "max_ms": ms.max(),
+        "throughput_rps": requests / wall if wall > 0 else float('inf'),
+    }
+
+async def run_load_test(url, routes, requests, concurrency, timeout):
+    async with httpx.AsyncClient(base_url=url, timeout=timeout) as client:
+        if any('{device_id}' in route for route in routes):
+            devices = (await client.get('/api/devices')).json()['devices']
+            routes = [route.replace('{device_id}', devices[0]) for route in routes]
+
+        results = []
+        for route in routes:
+            print(f"⏱️  {route} ({requests} requests, concurrency {concurrency})...")
+            results.append(await run_route(client, route, requests, concurrency))
+        return results
+
+def print_report(results):
+    header = f"{'route':<40} {'reqs':>5} {'errs':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'req/s':>8}"
+    print("\n" + header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['route']:<40} {r['requests']:>5} {r['errors']:>5} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} "
+              f"{r['p99_ms']:>9.1f} {r['max_ms']:>9.1f} {r['throughput_rps']:>8.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the InFlux API")
+    parser.add_argument('--url', help="Target a running server instead of booting one locally")
+    parser.add_argument('--devices', type=int, default=10, help="Synthetic dataset: number of devices")
+    parser.add_argument('--hours', type=int, default=168, help="Synthetic dataset: hourly readings per device")
+    parser.add_argument('--requests', type=int, default=20, help="Requests per route")
+    parser.add_argument('--concurrency', type=int, default=4, help="Requests in flight per route")
+    parser.add_argument('--timeout', type=float, default=300.0, help="Per-request timeout in seconds")
+    parser.add_argument('--routes', nargs='+', default=DEFAULT_ROUTES, help="Routes to drive")
+    parser.add_argument('--no-wait-warmup', action='store_true',
+                        help="Start timing as soon as GET / answers, while models may still be training")
+    args = parser.parse_args()
+
+    proc = None
+    url = args.url
+    with tempfile.TemporaryDirectory() as tmp:
+        if url is None:
+            csv_path = os.path.join(tmp, 'synthetic_energy.csv')
+            generate_synthetic_data(csv_path, args.devices, args.hours)
+            proc, url = start_server(csv_path, os.path.join(tmp, 'snapshots'), free_port())
+        try:
+            if not args.no_wait_warmup:
+                wait_for_warmup(url)
+            results = asyncio.run(run_load_test(url, args.routes, args.requests, args.concurrency, args.timeout))
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait()
+
+    print_report(results)
+
+if __name__ == "__main__":
+    main()